@@ -5,6 +5,25 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import math
+from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow export is optional; CSV always works
+    pa = None
+    pq = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # the compiled path kernel is optional; NumPy is the fallback
+    njit = None
+    prange = range
 
 # Configure page
 st.set_page_config(
@@ -149,6 +168,27 @@ TRANSLATIONS = {
         "crash_year": "Crash year (relative to start)",
         "crash_severity": "Crash severity",
         "crash_help": "-0.3 means a 30% market crash",
+        "rolling_cohorts": "Test every historical start year",
+        "rolling_cohorts_help": "Runs each strategy for the same number of years from every possible start year (runs in the background)",
+        "cohort_analysis": "🔁 Rolling Start-Year Analysis",
+        "cohort_progress": "Running historical start years",
+        "monte_carlo": "Run Monte Carlo scenarios",
+        "monte_carlo_help": "Simulates thousands of possible futures from returns fitted to the historical data (runs in the background)",
+        "return_model": "Return model",
+        "mc_paths": "Number of scenarios",
+        "model_normal": "Correlated normal",
+        "model_student_t": "Fat-tailed (Student-t)",
+        "model_regime": "Calm/stress regimes",
+        "mc_analysis": "🎲 Monte Carlo Scenarios",
+        "mc_progress": "Simulating scenarios",
+        "sensitivity": "Show sensitivity heatmaps",
+        "sensitivity_help": "How the outcome changes with more or less starting money, withdrawals and different start years",
+        "sensitivity_analysis": "🗺️ Sensitivity Analysis",
+        "export_data": "📥 Export Data",
+        "export_format": "File format",
+        "export_paths": "Download paths",
+        "export_summary": "Download summary",
+        "export_monte_carlo": "Download Monte Carlo paths",
         "starting_capital": "Starting Capital",
         "annual_withdrawal": "Annual Withdrawal",
         "time_period_metric": "Time Period",
@@ -191,6 +231,27 @@ TRANSLATIONS = {
         "crash_year": "폭락 연도 (시작 기준)",
         "crash_severity": "폭락 정도",
         "crash_help": "-0.3은 30% 시장 폭락을 의미합니다",
+        "rolling_cohorts": "모든 역사적 시작 연도 테스트",
+        "rolling_cohorts_help": "가능한 모든 시작 연도에서 같은 기간 동안 각 전략을 실행합니다 (백그라운드에서 실행)",
+        "cohort_analysis": "🔁 시작 연도별 분석",
+        "cohort_progress": "역사적 시작 연도 실행 중",
+        "monte_carlo": "몬테카를로 시나리오 실행",
+        "monte_carlo_help": "역사적 데이터로 추정한 수익률로 수천 개의 가능한 미래를 시뮬레이션합니다 (백그라운드에서 실행)",
+        "return_model": "수익률 모델",
+        "mc_paths": "시나리오 수",
+        "model_normal": "상관 정규분포",
+        "model_student_t": "두꺼운 꼬리 (스튜던트 t)",
+        "model_regime": "안정/위기 국면",
+        "mc_analysis": "🎲 몬테카를로 시나리오",
+        "mc_progress": "시나리오 시뮬레이션 중",
+        "sensitivity": "민감도 히트맵 보기",
+        "sensitivity_help": "시작 자금, 인출액, 시작 연도에 따라 결과가 어떻게 달라지는지 보여줍니다",
+        "sensitivity_analysis": "🗺️ 민감도 분석",
+        "export_data": "📥 데이터 내보내기",
+        "export_format": "파일 형식",
+        "export_paths": "경로 다운로드",
+        "export_summary": "요약 다운로드",
+        "export_monte_carlo": "몬테카를로 경로 다운로드",
         "starting_capital": "시작 자본",
         "annual_withdrawal": "연간 인출액",
         "time_period_metric": "기간",
@@ -209,6 +270,224 @@ TRANSLATIONS = {
     }
 }
 
+# Static educational content, per language: (expander label, markdown)
+STATIC_CONTENT = {
+    "en": {
+        "asset_classes": ("📚 What Are Asset Classes? (Investment Basics)", """
+### 🏛️ **Stocks (Equities)**
+- **Definition**: Shares representing ownership in a company
+- **Returns**: Capital appreciation + dividends
+- **Risk**: High (subject to market volatility)
+- **Examples**: Individual company shares like Apple, Microsoft, Samsung
+- **Historical Returns**: ~7-10% annually (inflation-adjusted) over long term
+
+### 🏦 **Bonds (Fixed Income)**
+- **Definition**: Loans to governments or corporations in exchange for interest
+- **Returns**: Fixed interest payments + principal repayment at maturity
+- **Risk**: Low to moderate (government bonds < corporate bonds)
+- **Examples**: UK Government Gilts, Corporate bonds
+- **Role**: Portfolio stability, defensive asset during stock market declines
+
+### 📈 **ETFs (Exchange-Traded Funds)**
+- **Definition**: Funds that hold many stocks/bonds and trade on exchanges
+- **Advantage**: Instant diversification across hundreds of companies
+- **Fees**: Lower than mutual funds (typically 0.1-0.8% annually)
+- **Examples**: S&P 500 ETF, Total Stock Market ETF
+- **Features**: Real-time trading, transparent holdings
+
+### 🏠 **REITs (Real Estate Investment Trusts)**
+- **Definition**: Companies that own income-generating real estate
+- **Returns**: Rental income + property value appreciation
+- **Advantage**: Access to commercial real estate with small amounts
+- **Dividends**: Typically high yield (4-8% annually)
+- **Examples**: Office buildings, shopping centers, warehouses
+
+### 💰 **Cash (Cash Equivalents)**
+- **Definition**: Bank deposits, savings accounts, short-term instruments
+- **Advantage**: 100% safe, immediately available
+- **Disadvantage**: Loses purchasing power to inflation
+- **Reality**: UK savings rates 2-3% vs inflation 3-4% = negative real return
+- **Purpose**: Emergency fund, short-term expenses
+"""),
+        "strategies": ("🎯 Understanding Investment Strategies", """
+### Strategy Characteristics:
+
+**🚀 Aggressive Growth (70% stocks)**
+- Suitable for young investors (20s-30s)
+- Can invest for 10-20+ years
+- Comfortable with short-term losses
+
+**⚖️ Balanced Growth (50% stocks)**
+- Good for middle-aged investors (40s-50s)
+- Want both growth and stability
+- Most commonly recommended strategy
+
+**🛡️ Conservative (20% stocks, 30% cash)**
+- Pre/post retirement (60+ years old)
+- Cannot afford major losses
+- But still exposed to inflation risk
+
+**💰 Cash Only (100% cash)**
+- Zero market risk
+- But purchasing power declines 2-3% annually
+- Ironically the riskiest long-term strategy!
+"""),
+        "tips": ("⚠️ Investment Guidelines & Tips", """
+### 🎯 **Principles for Successful Investing:**
+
+**1. Diversification is Key**
+- Don't put all eggs in one basket
+- Spread across different asset classes
+- Geographic diversification (domestic + international)
+
+**2. Time is Your Most Powerful Tool**
+- Compound interest: money making money
+- 10 years vs 20 years isn't 2x difference, it's 4x+
+- Starting early gives massive advantages
+
+**3. Avoid Emotional Investing**
+- Human nature: buy high (when excited), sell low (when scared)
+- This leads to poor returns
+- Stick to your strategy through ups and downs
+
+**4. Regular Investing (Dollar-Cost Averaging)**
+- Invest fixed amounts regularly (monthly)
+- No need to time the market
+- Smooths out average purchase prices over time
+
+### ⚠️ **Common Mistakes to Avoid:**
+- Focusing on short-term performance
+- Following others' success stories blindly
+- Investing without clear goals
+- Investing emergency funds
+- Buying investments you don't understand
+"""),
+        "results": """
+**Key Metrics Explained:**
+- **Final Value**: How much money is left at the end of the period
+- **Total Withdrawn**: Sum of all yearly withdrawals (adjusted for inflation if enabled)
+- **Max Drawdown**: Largest peak-to-trough decline during the period
+- **Volatility**: How much the returns varied year-to-year (higher = more volatile)
+- **Years Lasted**: How long the portfolio provided withdrawals before depletion
+- **Success Rate**: Whether the portfolio survived the entire period (simplified metric)
+
+**Asset Classes:**
+- **Stocks**: Company shares (higher risk, higher potential returns)
+- **Bonds**: Government/corporate debt (lower risk, steady income)
+- **ETFs**: Diversified investment funds (moderate risk)
+- **REITs**: Real estate investment trusts (property exposure)
+- **Cash**: Savings accounts (lowest risk, lowest returns)
+""",
+    },
+    "kr": {
+        "asset_classes": ("📚 자산 클래스란 무엇인가? (투자 기초 지식)", """
+### 🏛️ **주식 (Stocks)**
+- **정의**: 회사의 소유권 일부를 나타내는 증권
+- **수익원**: 주가 상승 + 배당금
+- **위험도**: 높음 (시장 변동성에 크게 영향받음)
+- **예시**: 삼성전자, 애플, 구글 등 개별 기업 주식
+- **장기 수익률**: 역사적으로 연평균 7-10% (인플레이션 조정 후)
+
+### 🏦 **채권 (Bonds)**
+- **정의**: 정부나 기업에 돈을 빌려주고 이자를 받는 증권
+- **수익원**: 고정 이자 지급 + 만기 시 원금 회수
+- **위험도**: 낮음~중간 (정부채 < 회사채)
+- **예시**: 한국 국채, 기업 회사채
+- **역할**: 포트폴리오 안정성 제공, 주식 하락 시 방어막
+
+### 📈 **ETF (상장지수펀드)**
+- **정의**: 여러 주식/채권을 묶어서 거래소에서 거래하는 펀드
+- **장점**: 한 번에 수백 개 기업에 분산투자 가능
+- **수수료**: 일반 펀드보다 저렴 (연 0.1-0.8%)
+- **예시**: KODEX 200 (한국 대형주 200개), S&P 500 ETF
+- **특징**: 실시간 거래 가능, 투명한 구성
+
+### 🏠 **부동산 투자신탁 (REITs)**
+- **정의**: 부동산에 투자하는 회사의 주식
+- **수익원**: 임대료 수입 + 부동산 가치 상승
+- **장점**: 적은 돈으로 대형 빌딩/쇼핑몰에 간접 투자
+- **배당**: 일반적으로 높은 배당 수익률 (4-8%)
+- **예시**: 오피스 빌딩, 쇼핑센터, 물류창고 투자 리츠
+
+### 💰 **현금 (Cash)**
+- **정의**: 은행 예금, 적금, 단기 금융상품
+- **장점**: 100% 안전, 언제든 사용 가능
+- **단점**: 인플레이션에 구매력 감소
+- **현실**: 한국 예금 금리 2-3% vs 물가상승률 3-4%
+- **역할**: 비상자금, 단기 지출 대비용
+"""),
+        "strategies": ("🎯 투자 전략 이해하기", """
+### 전략별 특징:
+
+**🚀 공격적 성장 (70% 주식)**
+- 젊은 나이 (20-30대)에 적합
+- 10-20년 장기투자 가능한 사람
+- 단기 손실 감수 가능한 성격
+
+**⚖️ 균형 성장 (50% 주식)**
+- 중년층 (40-50대)에 적합  
+- 성장과 안정성 모두 원하는 경우
+- 가장 일반적인 추천 전략
+
+**🛡️ 보수적 (20% 주식, 30% 현금)**
+- 은퇴 직전/후 (60대 이상)
+- 원금 손실을 절대 피하고 싶은 경우
+- 하지만 인플레이션 위험은 있음
+
+**💰 현금만 (100% 현금)**
+- 시장 위험은 0%
+- 하지만 구매력은 매년 2-3% 감소
+- 장기적으로는 가장 위험한 전략!
+"""),
+        "tips": ("⚠️ 투자 시 주의사항 및 팁", """
+### 🎯 **성공적인 투자를 위한 원칙:**
+
+**1. 분산투자가 핵심**
+- 한 바구니에 모든 달걀을 담지 마세요
+- 여러 자산 클래스에 나누어 투자
+- 지역적 분산 (한국 + 해외)
+
+**2. 시간이 가장 강력한 무기**
+- 복리 효과: 돈이 돈을 벌어주는 효과
+- 10년 vs 20년 투자 시 결과는 2배가 아닌 4배 차이
+- 일찍 시작할수록 유리
+
+**3. 감정적 투자 금지**
+- 주식이 오를 때 더 사고 싶고
+- 떨어질 때 팔고 싶은 것이 인간 심리
+- 하지만 이는 손실로 이어짐
+
+**4. 정기적 투자 (달러 비용 평균화)**
+- 매월 일정 금액씩 투자
+- 시장 타이밍을 예측할 필요 없음
+- 장기적으로 평균 매입가 안정화
+
+### ⚠️ **피해야 할 실수들:**
+- 단기 수익률에 집착
+- 남의 투자 성공담만 듣고 따라하기
+- 투자 목적 없이 무작정 시작
+- 비상자금 없이 전액 투자
+- 이해하지 못하는 상품에 투자
+"""),
+        "results": """
+**주요 지표 설명:**
+- **최종 가치**: 기간 말 남은 자금
+- **총 인출액**: 모든 연간 인출액의 합계 (인플레이션 조정 포함)
+- **최대 낙폭**: 기간 중 최대 고점에서 저점까지의 하락폭
+- **변동성**: 연간 수익률 변동 정도 (높을수록 변동성이 큼)
+- **지속 기간**: 포트폴리오가 인출을 제공한 기간
+- **성공률**: 전체 기간 동안 포트폴리오가 유지되었는지 여부
+
+**자산 클래스:**
+- **주식**: 기업 주식 (높은 위험, 높은 잠재 수익)
+- **채권**: 정부/기업 부채 (낮은 위험, 안정적 수입)
+- **ETF**: 분산투자 펀드 (중간 위험)
+- **부동산**: 부동산 투자 신탁 (부동산 노출)
+- **현금**: 저축 계좌 (최저 위험, 최저 수익)
+""",
+    },
+}
+
 def simulate_portfolio(start_year, end_year, start_capital, annual_withdrawal, inflation_adj, allocation, market_shock=None):
     """Enhanced simulation with market shock capability"""
     portfolio_values = []
@@ -268,47 +547,605 @@ def simulate_portfolio(start_year, end_year, start_capital, annual_withdrawal, i
 
     return portfolio_values, annual_returns
 
-def calculate_advanced_summary(portfolio_values, annual_returns, start_capital, annual_withdrawal, inflation_adj):
-    """Calculate comprehensive portfolio statistics"""
-    final_value = portfolio_values[-1]
-    years = len(portfolio_values)
-    
-    # Calculate total withdrawn
-    total_withdrawn = 0
-    withdrawal = annual_withdrawal
-    for i in range(years):
-        if portfolio_values[i] == 0 and i > 0 and portfolio_values[i-1] == 0:
-            break
-        total_withdrawn += withdrawal
+# === Vectorized Path Engine ===
+ASSET_CLASSES = ["stocks", "bonds", "etf", "reits", "cash"]
+
+def asset_return_matrix(start_year=YEARS[0], end_year=YEARS[-1]):
+    """Historical returns as a (years, asset classes) array in ASSET_CLASSES order"""
+    years = range(start_year, end_year + 1)
+    return np.array([
+        [STOCKS_RETURNS.get(y, 0), BONDS_RETURNS.get(y, 0), ETF_RETURNS.get(y, 0),
+         REITS_RETURNS.get(y, 0), CASH_RETURNS.get(y, 0)]
+        for y in years
+    ], dtype=float).reshape(-1, len(ASSET_CLASSES))
+
+def apply_allocation(asset_returns, allocation, market_shock=None):
+    """Weight asset returns of shape (..., years, asset classes) into portfolio returns"""
+    asset_returns = np.array(asset_returns, dtype=float)
+    stock_r, bond_r, etf_r, reit_r, cash_r = np.moveaxis(asset_returns, -1, 0)
+
+    if market_shock and 0 <= market_shock["year_index"] < stock_r.shape[-1]:
+        i = market_shock["year_index"]
+        shock_multiplier = 1 + market_shock["severity"]
+        stock_r[..., i] *= shock_multiplier
+        bond_r[..., i] *= shock_multiplier * 0.5
+        etf_r[..., i] *= shock_multiplier
+        reit_r[..., i] *= shock_multiplier * 0.8
+
+    return (
+        allocation["stocks"] * stock_r +
+        allocation["bonds"] * bond_r +
+        allocation["etf"] * etf_r +
+        allocation["reits"] * reit_r +
+        allocation["cash"] * cash_r
+    )
+
+def weighted_returns(start_year, end_year, allocation, market_shock=None):
+    """Yearly weighted returns for a historical window, matching simulate_portfolio"""
+    return apply_allocation(asset_return_matrix(start_year, end_year), allocation, market_shock)
+
+def simulate_paths(returns, start_capitals, annual_withdrawals, inflation_adj, backend=None):
+    """Run the withdrawal recursion for many paths at once.
+
+    ``returns`` is either one return series shared by every path (shape
+    ``(years,)``) or one series per path (shape ``(paths, years)``).
+    ``start_capitals`` and ``annual_withdrawals`` are scalars or per-path
+    arrays. Returns ``(portfolio_values, annual_returns)`` arrays of shape
+    ``(paths, years)`` with the same depletion rules as simulate_portfolio.
+    ``backend`` picks a PATH_BACKENDS kernel (default PATH_BACKEND); every
+    backend gives identical results.
+    """
+    backend = resolve_path_backend(backend)
+    returns = np.ascontiguousarray(np.atleast_2d(np.asarray(returns, dtype=float)))
+    capital = np.atleast_1d(np.asarray(start_capitals, dtype=float))
+    withdrawal = np.atleast_1d(np.asarray(annual_withdrawals, dtype=float))
+    n_paths = np.broadcast_shapes(returns.shape[:1], capital.shape, withdrawal.shape)[0]
+    n_years = returns.shape[1]
+
+    capital = np.broadcast_to(capital, (n_paths,)).copy()
+    withdrawal = np.broadcast_to(withdrawal, (n_paths,)).copy()
+    values = np.zeros((n_paths, n_years))
+    realised = np.zeros((n_paths, n_years))
+    PATH_BACKENDS[backend](returns, capital, withdrawal, inflation_adj, values, realised)
+    return values, realised
+
+def numpy_path_kernel(returns, capital, withdrawal, inflation_adj, values, realised):
+    """Path recursion as whole-array operations, one year at a time"""
+    portfolio = capital
+    alive = np.ones(len(capital), dtype=bool)
+    for i in range(values.shape[1]):
+        r = returns[:, i]
+        realised[:, i] = np.where(alive, r, 0.0)
+        portfolio = np.where(alive, np.maximum(portfolio * (1 + r) - withdrawal, 0.0), 0.0)
+        values[:, i] = portfolio
+        # Depleted paths stay at zero for the rest of the window
+        alive &= portfolio != 0
         if inflation_adj:
             withdrawal *= 1.02
-    
-    # Max drawdown
-    peak = -np.inf
-    max_drawdown = 0
-    for v in portfolio_values:
-        if v > peak:
-            peak = v
-        dd = (peak - v) / peak if peak > 0 else 0
-        if dd > max_drawdown:
-            max_drawdown = dd
-    
-    # Volatility (standard deviation of returns)
-    volatility = np.std(annual_returns) if annual_returns else 0
-    
-    # Years portfolio lasted
-    years_lasted = years if final_value > 0 else next((i+1 for i,v in enumerate(portfolio_values) if v == 0), years)
-    
-    # Success probability (simplified: did portfolio survive?)
-    success_rate = 1.0 if final_value > 0 else 0.0
-    
+        if not alive.any():
+            break
+
+def python_path_kernel(returns, capital, withdrawal, inflation_adj, values, realised):
+    """Path recursion as a per-path loop with simulate_portfolio's branches.
+
+    This is the pure-Python backend and, compiled with numba, the numba one.
+    """
+    n_paths, n_years = values.shape
+    # A single shared return series is reused for every path
+    row_step = 0 if returns.shape[0] == 1 else 1
+    for p in prange(n_paths):
+        row = p * row_step
+        portfolio = capital[p]
+        w = withdrawal[p]
+        for i in range(n_years):
+            r = returns[row, i]
+            realised[p, i] = r
+            portfolio = portfolio * (1 + r) - w
+            if portfolio < 0:
+                portfolio = 0.0
+            values[p, i] = portfolio
+            if inflation_adj:
+                w *= 1.02
+            # Remaining years keep their preset zeros
+            if portfolio == 0:
+                break
+
+PATH_BACKENDS = {
+    "numpy": numpy_path_kernel,
+    "python": python_path_kernel,
+}
+if njit is not None:
+    # Compiled serially: the app calls kernels from script and job threads, and
+    # parallel numba launched off the main thread keeps the process from exiting
+    PATH_BACKENDS["numba"] = njit(cache=True)(python_path_kernel)
+
+# Deployment-wide default; the numba backend is opt-in
+PATH_BACKEND = os.environ.get("PORTFOLIO_PATH_BACKEND", "numpy")
+
+def resolve_path_backend(backend=None):
+    """Pick a path backend, falling back to NumPy when the requested one is unavailable"""
+    backend = backend or PATH_BACKEND
+    if backend not in PATH_BACKENDS and backend != "numba":
+        raise ValueError(f"Unknown path backend: {backend!r}")
+    return backend if backend in PATH_BACKENDS else "numpy"
+
+def summarize_paths(portfolio_values, annual_returns, annual_withdrawals, inflation_adj):
+    """Comprehensive portfolio statistics for a batch of paths, as numeric arrays"""
+    n_paths, n_years = portfolio_values.shape
+    depleted = portfolio_values == 0
+    years_lasted = np.where(depleted.any(axis=1), depleted.argmax(axis=1) + 1, n_years)
+
+    # Withdrawals are counted up to and including the year the money ran out
+    growth = (1.02 if inflation_adj else 1.0) ** np.arange(n_years)
+    paid = np.arange(n_years) < years_lasted[:, None]
+    withdrawal = np.broadcast_to(np.asarray(annual_withdrawals, dtype=float), (n_paths,))
+    total_withdrawn = withdrawal * (growth * paid).sum(axis=1)
+
+    peak = np.maximum.accumulate(portfolio_values, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, (peak - portfolio_values) / peak, 0.0)
+
+    final_value = portfolio_values[:, -1]
+    return {
+        "final_value": final_value,
+        "total_withdrawn": total_withdrawn,
+        "max_drawdown": np.maximum(drawdown.max(axis=1), 0.0),
+        "volatility": annual_returns.std(axis=1),
+        "years_lasted": years_lasted,
+        "survived": final_value > 0,
+    }
+
+# === Strategy Results ===
+@dataclass(slots=True)
+class StrategyResult:
+    """Numeric simulation output for one strategy; formatting happens at display time"""
+    strategy: str
+    portfolio_values: np.ndarray
+    annual_returns: np.ndarray
+    final_value: float
+    total_withdrawn: float
+    max_drawdown: float
+    volatility: float
+    years_lasted: int
+    success_rate: float
+
+SUMMARY_DTYPE = np.dtype([
+    ("strategy", "U64"),
+    ("final_value", "f8"),
+    ("total_withdrawn", "f8"),
+    ("max_drawdown", "f8"),
+    ("volatility", "f8"),
+    ("years_lasted", "i4"),
+    ("success_rate", "f8"),
+])
+
+def run_strategies(strategies, start_year, end_year, start_capital, annual_withdrawal, inflation_adj, market_shock=None):
+    """Simulate every strategy in one batch; results share a single (strategies, years) array"""
+    returns = np.vstack([
+        weighted_returns(start_year, end_year, PRESET_STRATEGIES[strat], market_shock)
+        for strat in strategies
+    ])
+    values, realised = simulate_paths(returns, start_capital, annual_withdrawal, inflation_adj)
+    summary = summarize_paths(values, realised, annual_withdrawal, inflation_adj)
+    return {
+        strat: StrategyResult(
+            strategy=strat,
+            portfolio_values=values[i],
+            annual_returns=realised[i],
+            final_value=float(summary["final_value"][i]),
+            total_withdrawn=float(summary["total_withdrawn"][i]),
+            max_drawdown=float(summary["max_drawdown"][i]),
+            volatility=float(summary["volatility"][i]),
+            years_lasted=int(summary["years_lasted"][i]),
+            success_rate=float(summary["survived"][i]),
+        )
+        for i, strat in enumerate(strategies)
+    }
+
+def summary_records(results):
+    """Pack result summaries into a NumPy record array for caching and export"""
+    return np.array([
+        (r.strategy, r.final_value, r.total_withdrawn, r.max_drawdown,
+         r.volatility, r.years_lasted, r.success_rate)
+        for r in results.values()
+    ], dtype=SUMMARY_DTYPE)
+
+def format_summary(result, start_capital):
+    """Display strings for one strategy's summary row"""
+    years = len(result.portfolio_values)
+    return {
+        "Final Value (£)": f"£{result.final_value:,.0f}",
+        "Total Withdrawn (£)": f"£{result.total_withdrawn:,.0f}",
+        "Max Drawdown": f"{result.max_drawdown * 100:.1f}%",
+        "Volatility": f"{result.volatility * 100:.1f}%",
+        "Years Lasted": f"{result.years_lasted}/{years}",
+        "Success Rate": f"{result.success_rate * 100:.0f}%",
+        "Health": get_portfolio_health_color(result.final_value, start_capital),
+    }
+
+# === Sensitivity Analysis ===
+SENSITIVITY_STEPS = 50
+
+def sensitivity_grid(strategy, capitals, withdrawals, start_years, duration, inflation_adj, market_shock=None):
+    """Evaluate a start year x capital x withdrawal grid in closed form.
+
+    Every start year is run for the same ``duration`` years, like
+    rolling_cohort_analysis.
+
+    Withdrawals enter the recursion linearly, so before any clamping the value
+    after k years is ``P_k * (C - W * D_k)``, where ``P_k`` is the cumulative
+    growth and ``D_k`` the withdrawal schedule discounted by that growth.
+    ``D_k`` only increases, so a path survives year k exactly when
+    ``C > W * D_k``. That makes every cell of the grid a comparison against
+    one cumulative sum per start year instead of a separate simulation.
+    """
+    capitals = np.asarray(capitals, dtype=float)[:, None]
+    withdrawals = np.asarray(withdrawals, dtype=float)[None, :]
+    allocation = PRESET_STRATEGIES[strategy]
+    shape = (len(start_years), capitals.shape[0], withdrawals.shape[1])
+    survived = np.zeros(shape, dtype=bool)
+    terminal_value = np.zeros(shape)
+    years_lasted = np.zeros(shape, dtype=int)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(withdrawals > 0, capitals / withdrawals, np.inf)
+        for i, start_year in enumerate(start_years):
+            returns = weighted_returns(start_year, start_year + duration - 1, allocation, market_shock)
+            growth = np.cumprod(1 + returns)
+            schedule = (1.02 if inflation_adj else 1.0) ** np.arange(len(growth))
+            discounted = np.cumsum(schedule / growth)
+
+            # First year in which the discounted withdrawals reach the capital
+            depleted_at = np.searchsorted(discounted, ratio, side="left")
+            survived[i] = (depleted_at >= len(growth)) & (capitals > 0)
+            years_lasted[i] = np.minimum(depleted_at + 1, len(growth))
+            terminal_value[i] = np.where(
+                survived[i], growth[-1] * (capitals - withdrawals * discounted[-1]), 0.0
+            )
+
+    return {"survived": survived, "terminal_value": terminal_value, "years_lasted": years_lasted}
+
+def create_sensitivity_heatmaps(grid, capitals, withdrawals, start_years, duration, start_year, start_capital, annual_withdrawal):
+    """Survival rate across start years and terminal value for the selected start year"""
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=(
+            f'Survival Rate ({duration}-year windows starting {start_years[0]}-{start_years[-1]})',
+            f'Final Value (starting {start_year})'
+        ),
+        horizontal_spacing=0.12
+    )
+    fig.add_trace(
+        go.Heatmap(
+            x=withdrawals, y=capitals, z=grid["survived"].mean(axis=0) * 100,
+            colorscale='RdYlGn', zmin=0, zmax=100,
+            colorbar=dict(title='%', x=0.44),
+            hovertemplate='Capital: £%{y:,.0f}<br>Withdrawal: £%{x:,.0f}<br>Survived: %{z:.0f}%<extra></extra>'
+        ),
+        row=1, col=1
+    )
+    selected = list(start_years).index(start_year) if start_year in start_years else 0
+    fig.add_trace(
+        go.Heatmap(
+            x=withdrawals, y=capitals, z=grid["terminal_value"][selected],
+            colorscale='Viridis',
+            colorbar=dict(title='£'),
+            hovertemplate='Capital: £%{y:,.0f}<br>Withdrawal: £%{x:,.0f}<br>Final: £%{z:,.0f}<extra></extra>'
+        ),
+        row=1, col=2
+    )
+    # Mark the current inputs on both maps
+    for col in (1, 2):
+        fig.add_trace(
+            go.Scatter(
+                x=[annual_withdrawal], y=[start_capital], mode='markers',
+                marker=dict(symbol='x', size=12, color='black'),
+                showlegend=False, hoverinfo='skip'
+            ),
+            row=1, col=col
+        )
+    fig.update_xaxes(title_text="Yearly Withdrawal (£)")
+    fig.update_yaxes(title_text="Starting Capital (£)", col=1)
+    fig.update_layout(height=450, paper_bgcolor='white', plot_bgcolor='white')
+    return fig
+
+# === Parametric Return Generator ===
+RETURN_MODELS = ["normal", "student_t", "regime"]
+STUDENT_T_DOF = 5
+MONTE_CARLO_CHUNK = 2000  # paths generated per batch
+
+@st.cache_resource
+def fit_return_model(start_year=YEARS[0], end_year=YEARS[-1]):
+    """Fit means, volatilities and the covariance of the asset classes, once per dataset.
+
+    Also fits a two-regime model (stress years are those where stocks fell):
+    each regime has its own means and volatilities but shares the full-sample
+    correlation, so its Cholesky factor is the full one with rescaled rows.
+    """
+    data = asset_return_matrix(start_year, end_year)
+    mean = data.mean(axis=0)
+    cov = np.cov(data, rowvar=False)
+    vol = np.sqrt(np.diag(cov))
+    corr = cov / np.outer(vol, vol)
+    chol = np.linalg.cholesky(cov)
+
+    stress = data[:, 0] < 0
+    regimes = []
+    for in_regime in (~stress, stress):
+        sample = data[in_regime]
+        regime_vol = sample.std(axis=0, ddof=1) if len(sample) > 1 else vol
+        regimes.append({
+            "mean": sample.mean(axis=0) if len(sample) else mean,
+            "chol": chol * (regime_vol / vol)[:, None],
+        })
+
+    # Year-to-year regime transition probabilities (rows: from, cols: to)
+    transitions = np.ones((2, 2))  # add-one smoothing so no transition is impossible
+    for prev, curr in zip(stress[:-1].astype(int), stress[1:].astype(int)):
+        transitions[prev, curr] += 1
+    transitions /= transitions.sum(axis=1, keepdims=True)
+
+    return {
+        "mean": mean,
+        "vol": vol,
+        "cov": cov,
+        "corr": corr,
+        "chol": chol,
+        "regimes": regimes,
+        "transitions": transitions,
+        "stress_share": stress.mean(),
+    }
+
+def generate_asset_returns(fit, n_paths, n_years, model="normal", rng=None, dof=STUDENT_T_DOF):
+    """Draw correlated asset returns of shape (paths, years, asset classes).
+
+    ``model`` is "normal" (multivariate normal), "student_t" (multivariate t
+    scaled to the fitted covariance) or "regime" (two-state Markov switching).
+    Draws are clipped at -100%.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n_assets = len(ASSET_CLASSES)
+    z = rng.standard_normal((n_paths, n_years, n_assets))
+
+    if model == "normal":
+        draws = fit["mean"] + z @ fit["chol"].T
+    elif model == "student_t":
+        # Scale by sqrt((dof - 2) / chi2) so the variance matches the fitted covariance
+        chi2 = rng.chisquare(dof, size=(n_paths, n_years, 1))
+        draws = fit["mean"] + (z @ fit["chol"].T) * np.sqrt((dof - 2) / chi2)
+    elif model == "regime":
+        state = (rng.random(n_paths) < fit["stress_share"]).astype(int)
+        draws = np.empty_like(z)
+        for year in range(n_years):
+            if year > 0:
+                state = (rng.random(n_paths) < fit["transitions"][state, 1]).astype(int)
+            for s, regime in enumerate(fit["regimes"]):
+                in_state = state == s
+                draws[in_state, year] = regime["mean"] + z[in_state, year] @ regime["chol"].T
+    else:
+        raise ValueError(f"Unknown return model: {model!r}")
+
+    return np.maximum(draws, -1.0)
+
+def run_monte_carlo(strategy, n_years, start_capital, annual_withdrawal, inflation_adj,
+                    n_paths, model="normal", seed=None, market_shock=None):
+    """Simulate one strategy over generated scenarios through the vectorized path engine"""
+    fit = fit_return_model()
+    rng = np.random.default_rng(seed)
+    asset_returns = generate_asset_returns(fit, n_paths, n_years, model, rng)
+    returns = apply_allocation(asset_returns, PRESET_STRATEGIES[strategy], market_shock)
+    return simulate_paths(returns, start_capital, annual_withdrawal, inflation_adj)
+
+def monte_carlo_chunks(strategies, n_years, start_capital, annual_withdrawal, inflation_adj,
+                       n_paths, model="normal", market_shock=None, seed=0, keep_returns=False):
+    """Split a Monte Carlo run into per-strategy batches of MONTE_CARLO_CHUNK paths for a job.
+
+    Batches are seeded from ``seed``, so the same arguments always reproduce
+    the same paths. Annual returns are only kept with ``keep_returns``.
+    """
+    n_batches = math.ceil(n_paths / MONTE_CARLO_CHUNK)
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(strategies) * n_batches))
+    chunks = []
+    for strategy in strategies:
+        for b in range(n_batches):
+            size = min(MONTE_CARLO_CHUNK, n_paths - b * MONTE_CARLO_CHUNK)
+
+            def chunk(strategy=strategy, size=size, batch_seed=next(seeds)):
+                values, returns = run_monte_carlo(strategy, n_years, start_capital, annual_withdrawal,
+                                                  inflation_adj, size, model, batch_seed, market_shock)
+                result = {"strategy": strategy, "portfolio_values": values}
+                if keep_returns:
+                    result["annual_returns"] = returns
+                return result
+
+            chunks.append(chunk)
+    return chunks
+
+# === Export ===
+EXPORT_FORMATS = {
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow IPC", ".arrow", "application/vnd.apache.arrow.file"),
+    "csv": ("CSV", ".csv", "text/csv"),
+}
+
+def path_batch_table(strategy, portfolio_values, annual_returns, path_offset=0):
+    """Arrow record batch of paths, one row per path with per-year list columns.
+
+    The list columns wrap the engine's C-contiguous arrays without copying.
+    """
+    values = np.ascontiguousarray(portfolio_values, dtype=float)
+    returns = np.ascontiguousarray(annual_returns, dtype=float)
+    n_paths, n_years = values.shape
+    return pa.record_batch({
+        "strategy": pa.array([strategy]).take(pa.array(np.zeros(n_paths, dtype=np.int32))),
+        "path": pa.array(np.arange(path_offset, path_offset + n_paths, dtype=np.int64)),
+        "portfolio_values": pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), n_years),
+        "annual_returns": pa.FixedSizeListArray.from_arrays(pa.array(returns.ravel()), n_years),
+    })
+
+def export_paths(batches, sink, fmt, years):
+    """Stream ``(strategy, portfolio_values, annual_returns)`` batches to a file.
+
+    Each batch is written as soon as it is produced, so a Monte Carlo run can
+    be exported without holding every path in memory. CSV is written wide,
+    with one ``value_<year>`` and ``return_<year>`` column per year.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    if fmt != "csv" and pa is None:
+        raise RuntimeError("Parquet and Arrow export need pyarrow (pip install pyarrow)")
+
+    if fmt == "csv":
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, "w", newline="", encoding="utf-8") as f:
+                return export_paths(batches, f, fmt, years)
+        columns = [f"value_{y}" for y in years] + [f"return_{y}" for y in years]
+        for n, (strategy, portfolio_values, annual_returns, offset) in enumerate(number_path_batches(batches)):
+            chunk = pd.DataFrame(np.hstack([portfolio_values, annual_returns]), columns=columns)
+            chunk.insert(0, "path", np.arange(offset, offset + len(chunk)))
+            chunk.insert(0, "strategy", strategy)
+            chunk.to_csv(sink, header=n == 0, index=False)
+        return
+
+    writer = None
+    try:
+        for strategy, portfolio_values, annual_returns, offset in number_path_batches(batches):
+            batch = path_batch_table(strategy, portfolio_values, annual_returns, offset)
+            if writer is None:
+                schema = batch.schema.with_metadata({"years": ",".join(str(y) for y in years)})
+                writer = (pq.ParquetWriter(sink, schema) if fmt == "parquet"
+                          else pa.ipc.new_file(sink, schema))
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def number_path_batches(batches):
+    """Attach each batch's first path number, counting separately per strategy"""
+    offsets = {}
+    for strategy, portfolio_values, annual_returns in batches:
+        offset = offsets.get(strategy, 0)
+        offsets[strategy] = offset + len(portfolio_values)
+        yield strategy, portfolio_values, annual_returns, offset
+
+def export_summary(results, sink, fmt):
+    """Write numeric summary metrics (SUMMARY_DTYPE columns) for every strategy"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    records = summary_records(results)
+    if fmt == "csv":
+        pd.DataFrame(records).to_csv(sink, index=False)
+        return
+    if pa is None:
+        raise RuntimeError("Parquet and Arrow export need pyarrow (pip install pyarrow)")
+    table = pa.table({name: records[name] for name in records.dtype.names})
+    if fmt == "parquet":
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+def export_monte_carlo(sink, fmt, strategies, n_years, start_capital, annual_withdrawal, inflation_adj,
+                       n_paths, model="normal", market_shock=None, seed=0, start_year=YEARS[0]):
+    """Generate and export a Monte Carlo run one batch at a time"""
+    chunks = monte_carlo_chunks(strategies, n_years, start_capital, annual_withdrawal,
+                                inflation_adj, n_paths, model, market_shock, seed, keep_returns=True)
+    batches = ((r["strategy"], r["portfolio_values"], r["annual_returns"])
+               for r in (chunk() for chunk in chunks))
+    export_paths(batches, sink, fmt, list(range(start_year, start_year + n_years)))
+
+def export_bytes(write, fmt):
+    """Run an export writer against an in-memory buffer and return its bytes"""
+    buffer = io.StringIO() if fmt == "csv" else io.BytesIO()
+    write(buffer)
+    data = buffer.getvalue()
+    return data.encode("utf-8") if fmt == "csv" else data
+
+# === Batch Client Evaluation ===
+def evaluate_clients(client_specs):
+    """Evaluate a book of clients, batching those that share a window and strategy.
+
+    Each spec is a dict with ``start_capital``, ``annual_withdrawal``,
+    ``start_year``, ``end_year`` and ``strategy`` (a PRESET_STRATEGIES key),
+    plus optional ``inflation_adj`` (default True) and ``market_shock``.
+    Windows must lie within the historical data (YEARS). Results come back in input order; ``latency_ms`` on each result is the
+    time taken by the batch it was evaluated in.
+    """
+    groups = {}
+    for index, spec in enumerate(client_specs):
+        strategy = spec["strategy"]
+        if strategy not in PRESET_STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy!r}")
+        if spec["end_year"] < spec["start_year"]:
+            raise ValueError(f"end_year {spec['end_year']} is before start_year {spec['start_year']}")
+        if spec["start_year"] < YEARS[0] or spec["end_year"] > YEARS[-1]:
+            raise ValueError(f"Window {spec['start_year']}-{spec['end_year']} is outside "
+                             f"the historical data {YEARS[0]}-{YEARS[-1]}")
+        shock = spec.get("market_shock")
+        key = (
+            spec["start_year"], spec["end_year"], strategy,
+            bool(spec.get("inflation_adj", True)),
+            (shock["year_index"], shock["severity"]) if shock else None,
+        )
+        groups.setdefault(key, []).append(index)
+
+    results = [None] * len(client_specs)
+    batch_start = time.perf_counter()
+    for (start_year, end_year, strategy, inflation_adj, shock), indices in groups.items():
+        group_start = time.perf_counter()
+        market_shock = {"year_index": shock[0], "severity": shock[1]} if shock else None
+        returns = weighted_returns(start_year, end_year, PRESET_STRATEGIES[strategy], market_shock)
+        capitals = np.array([client_specs[i]["start_capital"] for i in indices], dtype=float)
+        withdrawals = np.array([client_specs[i]["annual_withdrawal"] for i in indices], dtype=float)
+        values, realised = simulate_paths(returns, capitals, withdrawals, inflation_adj)
+        summary = summarize_paths(values, realised, withdrawals, inflation_adj)
+        latency_ms = (time.perf_counter() - group_start) * 1000
+
+        for row, i in enumerate(indices):
+            results[i] = {
+                "strategy": strategy,
+                "years": list(range(start_year, end_year + 1)),
+                "portfolio_values": values[row],
+                "annual_returns": realised[row],
+                "final_value": float(summary["final_value"][row]),
+                "total_withdrawn": float(summary["total_withdrawn"][row]),
+                "max_drawdown": float(summary["max_drawdown"][row]),
+                "volatility": float(summary["volatility"][row]),
+                "years_lasted": int(summary["years_lasted"][row]),
+                "survived": bool(summary["survived"][row]),
+                "batch_size": len(indices),
+                "latency_ms": latency_ms,
+            }
+
+    latencies = np.array([r["latency_ms"] for r in results]) if results else np.zeros(1)
+    stats = {
+        "requests": len(client_specs),
+        "batches": len(groups),
+        "total_ms": (time.perf_counter() - batch_start) * 1000,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "max_ms": float(latencies.max()),
+    }
+    return {"results": results, "stats": stats}
+
+def rolling_cohort_analysis(strategy, duration, start_capital, annual_withdrawal, inflation_adj, market_shock=None):
+    """Run one strategy for the same number of years from every historical start year"""
+    allocation = PRESET_STRATEGIES[strategy]
+    final_values = []
+    for cohort_start in range(YEARS[0], YEARS[-1] - duration + 2):
+        port_vals, _ = simulate_portfolio(
+            cohort_start, cohort_start + duration - 1, start_capital,
+            annual_withdrawal, inflation_adj, allocation, market_shock
+        )
+        final_values.append(port_vals[-1])
+
+    survived = sum(1 for v in final_values if v > 0)
     return {
-        "Final Value (£)": f"£{final_value:,.0f}",
-        "Total Withdrawn (£)": f"£{total_withdrawn:,.0f}",
-        "Max Drawdown": f"{max_drawdown * 100:.1f}%",
-        "Volatility": f"{volatility * 100:.1f}%",
-        "Years Lasted": f"{years_lasted}/{years}",
-        "Success Rate": f"{success_rate * 100:.0f}%"
+        "strategy": strategy,
+        "cohorts": len(final_values),
+        "survival_rate": survived / len(final_values) if final_values else 0.0,
+        "median_final": float(np.median(final_values)) if final_values else 0.0,
+        "worst_final": min(final_values) if final_values else 0.0,
     }
 
 def get_portfolio_health_color(final_value, start_capital):
@@ -322,6 +1159,22 @@ def get_portfolio_health_color(final_value, start_capital):
     else:
         return "🔴 Poor"
 
+# Use distinct, non-light colors that are easily visible
+CHART_COLORS = [
+    '#1f77b4',  # Blue
+    '#ff7f0e',  # Orange  
+    '#2ca02c',  # Green
+    '#d62728',  # Red
+    '#9467bd',  # Purple
+    '#8c564b',  # Brown
+    '#e377c2',  # Pink
+    '#7f7f7f',  # Gray
+    '#bcbd22',  # Olive
+    '#17becf',  # Cyan
+    '#aec7e8',  # Light Blue
+    '#ffbb78'   # Light Orange
+]
+
 def create_comparison_chart(results, years):
     """Create an enhanced comparison chart with better colors"""
     fig = make_subplots(
@@ -331,30 +1184,14 @@ def create_comparison_chart(results, years):
         row_heights=[0.7, 0.3]
     )
     
-    # Use distinct, non-light colors that are easily visible
-    colors = [
-        '#1f77b4',  # Blue
-        '#ff7f0e',  # Orange  
-        '#2ca02c',  # Green
-        '#d62728',  # Red
-        '#9467bd',  # Purple
-        '#8c564b',  # Brown
-        '#e377c2',  # Pink
-        '#7f7f7f',  # Gray
-        '#bcbd22',  # Olive
-        '#17becf',  # Cyan
-        '#aec7e8',  # Light Blue
-        '#ffbb78'   # Light Orange
-    ]
-    
     for i, (strat, data) in enumerate(results.items()):
-        color = colors[i % len(colors)]
+        color = CHART_COLORS[i % len(CHART_COLORS)]
         
         # Portfolio values
         fig.add_trace(
             go.Scatter(
                 x=years,
-                y=data["portfolio_values"],
+                y=data.portfolio_values,
                 mode='lines+markers',
                 name=strat,
                 line=dict(color=color, width=3),
@@ -368,7 +1205,7 @@ def create_comparison_chart(results, years):
         fig.add_trace(
             go.Scatter(
                 x=years,
-                y=[r * 100 for r in data["annual_returns"]],
+                y=data.annual_returns * 100,
                 mode='lines',
                 name=f'{strat} Returns',
                 line=dict(color=color, width=2, dash='dot'),
@@ -392,20 +1229,16 @@ def create_comparison_chart(results, years):
     
     return fig
 
-def create_allocation_table(strategies_selected, lang="en"):
-    """Create a clean allocation table without any highlighting or formatting issues"""
-    if not strategies_selected:
-        return None
-    
-    # Headers based on language
-    if lang == "kr":
-        headers = ["ID", "전략명", "주식", "채권", "ETF", "부동산", "현금"]
-    else:
-        headers = ["ID", "Strategy Name", "Stocks", "Bonds", "ETFs", "REITs", "Cash"]
-    
-    table_data = []
-    for i, strategy in enumerate(strategies_selected, 1):
-        allocation = PRESET_STRATEGIES[strategy]
+ALLOCATION_HEADERS = {
+    "en": ["ID", "Strategy Name", "Stocks", "Bonds", "ETFs", "REITs", "Cash"],
+    "kr": ["ID", "전략명", "주식", "채권", "ETF", "부동산", "현금"],
+}
+
+@st.cache_resource
+def get_allocation_rows(lang="en"):
+    """Display name and allocation percentages for every preset strategy, built once per language"""
+    rows = {}
+    for strategy, allocation in PRESET_STRATEGIES.items():
         # Clean strategy name (remove emoji)
         clean_name = strategy.split(' ', 1)[1] if ' ' in strategy else strategy
         if lang == "kr" and '(' in clean_name and ')' in clean_name:
@@ -415,20 +1248,200 @@ def create_allocation_table(strategies_selected, lang="en"):
         elif lang == "en" and '(' in clean_name:
             # Remove Korean part for English
             clean_name = clean_name.split('(')[0].strip()
-            
-        table_data.append([
-            chr(65 + i - 1),  # A, B, C, etc.
+
+        rows[strategy] = [
             clean_name,
             f"{allocation['stocks']*100:.0f}%",
             f"{allocation['bonds']*100:.0f}%",
             f"{allocation['etf']*100:.0f}%",
             f"{allocation['reits']*100:.0f}%",
             f"{allocation['cash']*100:.0f}%"
-        ])
+        ]
+    return rows
+
+def create_allocation_table(strategies_selected, lang="en"):
+    """Create a clean allocation table without any highlighting or formatting issues"""
+    if not strategies_selected:
+        return None
     
-    # Create DataFrame
-    df = pd.DataFrame(table_data, columns=headers)
-    return df
+    rows = get_allocation_rows(lang)
+    table_data = [
+        [chr(65 + i), *rows[strategy]]  # A, B, C, etc.
+        for i, strategy in enumerate(strategies_selected)
+    ]
+    return pd.DataFrame(table_data, columns=ALLOCATION_HEADERS[lang])
+
+@st.fragment
+def render_static_expander(label, body, key):
+    """Expander whose static markdown is only rendered, and sent, while it is open.
+
+    Runs as a fragment, so opening or closing it reruns just this expander.
+    """
+    expander = st.expander(label, key=key, on_change="rerun")
+    if expander.open:
+        expander.markdown(body)
+
+# === Background Analysis Jobs ===
+JOB_WORKERS = 4
+JOB_POLL_INTERVAL = 0.5  # seconds between progress refreshes
+
+@st.cache_resource
+def get_job_executor():
+    """Process-wide thread pool shared by every session's background jobs"""
+    return ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="analysis-job")
+
+class AnalysisJob:
+    """A chunked analysis running on the shared executor.
+
+    Each chunk is a zero-argument callable. Results are collected in order as
+    chunks finish so the page can render partial output, and cancellation is
+    checked between chunks.
+    """
+
+    def __init__(self, key, chunks):
+        self.key = key
+        self.total = len(chunks)
+        self._chunks = list(chunks)
+        self._results = []
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self.future = get_job_executor().submit(self._run)
+
+    def _run(self):
+        for chunk in self._chunks:
+            if self._cancelled.is_set():
+                return
+            result = chunk()
+            with self._lock:
+                self._results.append(result)
+
+    def cancel(self):
+        self._cancelled.set()
+        self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def progress(self):
+        with self._lock:
+            completed = len(self._results)
+        return completed / self.total if self.total else 1.0
+
+    def partial_results(self):
+        with self._lock:
+            return list(self._results)
+
+def submit_job(name, key, chunks):
+    """Start the session's job for an analysis, or reattach if the inputs are unchanged"""
+    jobs = st.session_state.setdefault("analysis_jobs", {})
+    job = jobs.get(name)
+    if job is not None and job.key == key and not job.cancelled:
+        return job
+    if job is not None:
+        # Inputs changed - stop the abandoned job from burning CPU
+        job.cancel()
+    job = AnalysisJob(key, chunks)
+    jobs[name] = job
+    return job
+
+def cancel_job(name):
+    """Cancel and forget the session's job for an analysis, if any"""
+    jobs = st.session_state.get("analysis_jobs", {})
+    job = jobs.pop(name, None)
+    if job is not None:
+        job.cancel()
+
+def render_job_status(job, render_partial, label, polling):
+    """Progress bar and partial results for a job, as they stand right now"""
+    finished = job.done
+    results = job.partial_results()
+    if not finished:
+        st.progress(job.progress, text=f"{label} ({len(results)}/{job.total})")
+    render_partial(results)
+    if finished:
+        error = None if job.future.cancelled() else job.future.exception()
+        if error is not None:
+            st.error(f"Analysis failed: {error}")
+        if polling:
+            # Rerun the app once so the fragment is rebuilt without its timer
+            st.rerun()
+
+def stream_job(job, render_partial, label):
+    """Show a job's progress without blocking the script thread.
+
+    The status area is a fragment that refreshes every JOB_POLL_INTERVAL while
+    the job runs, so the rest of the page renders straight away.
+    """
+    run_every = None if job.done else JOB_POLL_INTERVAL
+    st.fragment(render_job_status, run_every=run_every)(job, render_partial, label, run_every is not None)
+
+def render_monte_carlo_results(results, years):
+    """Render fan chart and outcome table from the scenario batches finished so far"""
+    if not results:
+        return
+    by_strategy = {}
+    for r in results:
+        by_strategy.setdefault(r["strategy"], []).append(r["portfolio_values"])
+
+    fig = go.Figure()
+    table = {}
+    for i, (strat, batches) in enumerate(by_strategy.items()):
+        values = np.vstack(batches)
+        p10, p50, p90 = np.percentile(values, [10, 50, 90], axis=0)
+        color = CHART_COLORS[i % len(CHART_COLORS)]
+        red, green, blue = px.colors.hex_to_rgb(color)
+
+        fig.add_trace(go.Scatter(x=years, y=p90, mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=years, y=p10, mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor=f'rgba({red},{green},{blue},0.15)',
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(
+            x=years, y=p50, mode='lines', name=strat,
+            line=dict(color=color, width=3),
+            hovertemplate=f'<b>{strat}</b><br>Year: %{{x}}<br>Median: £%{{y:,.0f}}<extra></extra>'
+        ))
+
+        final = values[:, -1]
+        table[strat] = {
+            "Scenarios": len(values),
+            "Success Probability": f"{(final > 0).mean() * 100:.1f}%",
+            "10th Percentile (£)": f"£{np.percentile(final, 10):,.0f}",
+            "Median Final Value (£)": f"£{np.median(final):,.0f}",
+            "90th Percentile (£)": f"£{np.percentile(final, 90):,.0f}",
+        }
+
+    fig.update_layout(
+        height=450,
+        title_text="Simulated Portfolio Value (median, 10th-90th percentile band)",
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    fig.update_xaxes(title_text="Year", gridcolor='lightgray')
+    fig.update_yaxes(title_text="Portfolio Value (£)", gridcolor='lightgray')
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(pd.DataFrame(table).T, use_container_width=True)
+
+def render_cohort_results(results):
+    """Render the rolling start-year table from whichever strategies have finished"""
+    if not results:
+        return
+    cohort_df = pd.DataFrame({
+        r["strategy"]: {
+            "Start Years Tested": r["cohorts"],
+            "Survival Rate": f"{r['survival_rate'] * 100:.0f}%",
+            "Median Final Value (£)": f"£{r['median_final']:,.0f}",
+            "Worst Final Value (£)": f"£{r['worst_final']:,.0f}",
+        }
+        for r in results
+    }).T
+    st.dataframe(cohort_df, use_container_width=True)
 
 def main():
     # Language toggle
@@ -526,6 +1539,16 @@ def main():
                 shock_year = st.slider(t["crash_year"], 1, min(10, end_year - start_year), 1)
                 shock_severity = st.slider(t["crash_severity"], -0.5, -0.1, -0.3, 0.05,
                                          help=t["crash_help"])
+            run_cohorts = st.checkbox(t["rolling_cohorts"], value=False,
+                                      help=t["rolling_cohorts_help"])
+            run_monte_carlo_paths = st.checkbox(t["monte_carlo"], value=False,
+                                                help=t["monte_carlo_help"])
+            if run_monte_carlo_paths:
+                return_model = st.selectbox(t["return_model"], RETURN_MODELS,
+                                            format_func=lambda m: t[f"model_{m}"])
+                mc_paths = st.select_slider(t["mc_paths"], [1000, 2000, 5000, 10000, 20000, 50000], 10000)
+            show_sensitivity = st.checkbox(t["sensitivity"], value=False,
+                                           help=t["sensitivity_help"])
     
     # Main content area
     if not strategies_selected:
@@ -547,28 +1570,16 @@ def main():
         st.metric(t["inflation_adjusted"], inflation_text)
     
     # Run simulations
-    results = {}
     years = list(range(start_year, end_year + 1))
     
     market_shock = None
     if simulate_shock:
         market_shock = {"year_index": shock_year - 1, "severity": shock_severity}
     
-    for strat in strategies_selected:
-        allocation = PRESET_STRATEGIES[strat]
-        port_vals, returns = simulate_portfolio(
-            start_year, end_year, start_capital, annual_withdrawal, 
-            inflation_adj, allocation, market_shock
-        )
-        summary = calculate_advanced_summary(
-            port_vals, returns, start_capital, annual_withdrawal, inflation_adj
-        )
-        results[strat] = {
-            "portfolio_values": port_vals,
-            "annual_returns": returns,
-            "summary": summary,
-            "allocation": allocation
-        }
+    results = run_strategies(
+        strategies_selected, start_year, end_year, start_capital,
+        annual_withdrawal, inflation_adj, market_shock
+    )
     
     # Create and display chart
     fig = create_comparison_chart(results, years)
@@ -577,16 +1588,98 @@ def main():
     # Summary comparison
     st.subheader(t["strategy_comparison"])
     
-    # Create comparison table
-    summary_data = {}
-    for strat, data in results.items():
-        summary_data[strat] = data["summary"]
-        # Add health indicator
-        final_val = data["portfolio_values"][-1]
-        summary_data[strat]["Health"] = get_portfolio_health_color(final_val, start_capital)
+    # Create comparison table, formatting the numeric results only for display
+    summary_data = {strat: format_summary(data, start_capital) for strat, data in results.items()}
     
     summary_df = pd.DataFrame(summary_data).T
     st.dataframe(summary_df, use_container_width=True)
+
+    # Sensitivity grid is closed-form, so it is computed inline for every strategy
+    if show_sensitivity:
+        st.subheader(t["sensitivity_analysis"])
+        capitals = np.linspace(max(1000, start_capital * 0.25), start_capital * 2, SENSITIVITY_STEPS)
+        withdrawals = np.linspace(0, max(annual_withdrawal * 2, start_capital * 0.1), SENSITIVITY_STEPS)
+        duration = end_year - start_year + 1
+        start_years = list(range(YEARS[0], YEARS[-1] - duration + 2))
+        tabs = st.tabs(strategies_selected)
+        for tab, strat in zip(tabs, strategies_selected):
+            with tab:
+                grid = sensitivity_grid(strat, capitals, withdrawals, start_years, duration,
+                                        inflation_adj, market_shock)
+                st.plotly_chart(
+                    create_sensitivity_heatmaps(grid, capitals, withdrawals, start_years, duration,
+                                                start_year, start_capital, annual_withdrawal),
+                    use_container_width=True
+                )
+
+    # Rolling start-year analysis runs in the background and streams in per strategy
+    if run_cohorts:
+        st.subheader(t["cohort_analysis"])
+        duration = end_year - start_year + 1
+        shock_key = (market_shock["year_index"], market_shock["severity"]) if market_shock else None
+        job_key = (tuple(strategies_selected), duration, start_capital, annual_withdrawal, inflation_adj, shock_key)
+        chunks = [
+            (lambda strat=strat: rolling_cohort_analysis(
+                strat, duration, start_capital, annual_withdrawal, inflation_adj, market_shock
+            ))
+            for strat in strategies_selected
+        ]
+        job = submit_job("cohorts", job_key, chunks)
+        stream_job(job, render_cohort_results, t["cohort_progress"])
+    else:
+        cancel_job("cohorts")
+
+    # Monte Carlo scenarios are generated in batches and streamed in as they finish
+    mc_job = None
+    if run_monte_carlo_paths:
+        st.subheader(t["mc_analysis"])
+        duration = end_year - start_year + 1
+        shock_key = (market_shock["year_index"], market_shock["severity"]) if market_shock else None
+        job_key = (tuple(strategies_selected), duration, start_capital, annual_withdrawal,
+                   inflation_adj, shock_key, return_model, mc_paths)
+        chunks = monte_carlo_chunks(strategies_selected, duration, start_capital, annual_withdrawal,
+                                    inflation_adj, mc_paths, return_model, market_shock)
+        mc_job = submit_job("monte_carlo", job_key, chunks)
+        stream_job(mc_job, lambda partial: render_monte_carlo_results(partial, years), t["mc_progress"])
+    else:
+        cancel_job("monte_carlo")
+
+    # Exports are generated only when a download button is clicked
+    st.subheader(t["export_data"])
+    formats = [fmt for fmt in EXPORT_FORMATS if fmt == "csv" or pa is not None]
+    export_format = st.selectbox(t["export_format"], formats, format_func=lambda f: EXPORT_FORMATS[f][0])
+    _, extension, mime = EXPORT_FORMATS[export_format]
+    path_batches = [
+        (strat, data.portfolio_values[None, :], data.annual_returns[None, :])
+        for strat, data in results.items()
+    ]
+    export_cols = st.columns(3)
+    with export_cols[0]:
+        st.download_button(
+            t["export_paths"],
+            lambda: export_bytes(lambda sink: export_paths(path_batches, sink, export_format, years), export_format),
+            file_name=f"portfolio_paths{extension}", mime=mime
+        )
+    with export_cols[1]:
+        st.download_button(
+            t["export_summary"],
+            lambda: export_bytes(lambda sink: export_summary(results, sink, export_format), export_format),
+            file_name=f"portfolio_summary{extension}", mime=mime
+        )
+    if mc_job is not None and mc_job.done and not mc_job.cancelled:
+        # Regenerated batch by batch from the job's seeds rather than kept in session state
+        with export_cols[2]:
+            st.download_button(
+                t["export_monte_carlo"],
+                lambda: export_bytes(
+                    lambda sink: export_monte_carlo(
+                        sink, export_format, strategies_selected, duration, start_capital, annual_withdrawal,
+                        inflation_adj, mc_paths, return_model, market_shock, start_year=start_year
+                    ),
+                    export_format
+                ),
+                file_name=f"monte_carlo_paths{extension}", mime=mime
+            )
     
     # Compact allocation table  
     st.subheader(t["portfolio_allocations"])
@@ -605,206 +1698,18 @@ def main():
         
         st.caption("💡 The allocation percentages above determine how your portfolio performs. Each strategy spreads your money differently across asset types.")
     
-    # Educational sections
-    if lang_code == "kr":
-        with st.expander("📚 자산 클래스란 무엇인가? (투자 기초 지식)"):
-            st.markdown("""
-            ### 🏛️ **주식 (Stocks)**
-            - **정의**: 회사의 소유권 일부를 나타내는 증권
-            - **수익원**: 주가 상승 + 배당금
-            - **위험도**: 높음 (시장 변동성에 크게 영향받음)
-            - **예시**: 삼성전자, 애플, 구글 등 개별 기업 주식
-            - **장기 수익률**: 역사적으로 연평균 7-10% (인플레이션 조정 후)
-            
-            ### 🏦 **채권 (Bonds)**
-            - **정의**: 정부나 기업에 돈을 빌려주고 이자를 받는 증권
-            - **수익원**: 고정 이자 지급 + 만기 시 원금 회수
-            - **위험도**: 낮음~중간 (정부채 < 회사채)
-            - **예시**: 한국 국채, 기업 회사채
-            - **역할**: 포트폴리오 안정성 제공, 주식 하락 시 방어막
-            
-            ### 📈 **ETF (상장지수펀드)**
-            - **정의**: 여러 주식/채권을 묶어서 거래소에서 거래하는 펀드
-            - **장점**: 한 번에 수백 개 기업에 분산투자 가능
-            - **수수료**: 일반 펀드보다 저렴 (연 0.1-0.8%)
-            - **예시**: KODEX 200 (한국 대형주 200개), S&P 500 ETF
-            - **특징**: 실시간 거래 가능, 투명한 구성
-            
-            ### 🏠 **부동산 투자신탁 (REITs)**
-            - **정의**: 부동산에 투자하는 회사의 주식
-            - **수익원**: 임대료 수입 + 부동산 가치 상승
-            - **장점**: 적은 돈으로 대형 빌딩/쇼핑몰에 간접 투자
-            - **배당**: 일반적으로 높은 배당 수익률 (4-8%)
-            - **예시**: 오피스 빌딩, 쇼핑센터, 물류창고 투자 리츠
-            
-            ### 💰 **현금 (Cash)**
-            - **정의**: 은행 예금, 적금, 단기 금융상품
-            - **장점**: 100% 안전, 언제든 사용 가능
-            - **단점**: 인플레이션에 구매력 감소
-            - **현실**: 한국 예금 금리 2-3% vs 물가상승률 3-4%
-            - **역할**: 비상자금, 단기 지출 대비용
-            """)
-            
-        with st.expander("🎯 투자 전략 이해하기"):
-            st.markdown("""
-            ### 전략별 특징:
-            
-            **🚀 공격적 성장 (70% 주식)**
-            - 젊은 나이 (20-30대)에 적합
-            - 10-20년 장기투자 가능한 사람
-            - 단기 손실 감수 가능한 성격
-            
-            **⚖️ 균형 성장 (50% 주식)**
-            - 중년층 (40-50대)에 적합  
-            - 성장과 안정성 모두 원하는 경우
-            - 가장 일반적인 추천 전략
-            
-            **🛡️ 보수적 (20% 주식, 30% 현금)**
-            - 은퇴 직전/후 (60대 이상)
-            - 원금 손실을 절대 피하고 싶은 경우
-            - 하지만 인플레이션 위험은 있음
-            
-            **💰 현금만 (100% 현금)**
-            - 시장 위험은 0%
-            - 하지만 구매력은 매년 2-3% 감소
-            - 장기적으로는 가장 위험한 전략!
-            """)
-    else:
-        with st.expander("📚 What Are Asset Classes? (Investment Basics)"):
-            st.markdown("""
-            ### 🏛️ **Stocks (Equities)**
-            - **Definition**: Shares representing ownership in a company
-            - **Returns**: Capital appreciation + dividends
-            - **Risk**: High (subject to market volatility)
-            - **Examples**: Individual company shares like Apple, Microsoft, Samsung
-            - **Historical Returns**: ~7-10% annually (inflation-adjusted) over long term
-            
-            ### 🏦 **Bonds (Fixed Income)**
-            - **Definition**: Loans to governments or corporations in exchange for interest
-            - **Returns**: Fixed interest payments + principal repayment at maturity
-            - **Risk**: Low to moderate (government bonds < corporate bonds)
-            - **Examples**: UK Government Gilts, Corporate bonds
-            - **Role**: Portfolio stability, defensive asset during stock market declines
-            
-            ### 📈 **ETFs (Exchange-Traded Funds)**
-            - **Definition**: Funds that hold many stocks/bonds and trade on exchanges
-            - **Advantage**: Instant diversification across hundreds of companies
-            - **Fees**: Lower than mutual funds (typically 0.1-0.8% annually)
-            - **Examples**: S&P 500 ETF, Total Stock Market ETF
-            - **Features**: Real-time trading, transparent holdings
-            
-            ### 🏠 **REITs (Real Estate Investment Trusts)**
-            - **Definition**: Companies that own income-generating real estate
-            - **Returns**: Rental income + property value appreciation
-            - **Advantage**: Access to commercial real estate with small amounts
-            - **Dividends**: Typically high yield (4-8% annually)
-            - **Examples**: Office buildings, shopping centers, warehouses
-            
-            ### 💰 **Cash (Cash Equivalents)**
-            - **Definition**: Bank deposits, savings accounts, short-term instruments
-            - **Advantage**: 100% safe, immediately available
-            - **Disadvantage**: Loses purchasing power to inflation
-            - **Reality**: UK savings rates 2-3% vs inflation 3-4% = negative real return
-            - **Purpose**: Emergency fund, short-term expenses
-            """)
-            
-        with st.expander("🎯 Understanding Investment Strategies"):
-            st.markdown("""
-            ### Strategy Characteristics:
-            
-            **🚀 Aggressive Growth (70% stocks)**
-            - Suitable for young investors (20s-30s)
-            - Can invest for 10-20+ years
-            - Comfortable with short-term losses
-            
-            **⚖️ Balanced Growth (50% stocks)**
-            - Good for middle-aged investors (40s-50s)
-            - Want both growth and stability
-            - Most commonly recommended strategy
-            
-            **🛡️ Conservative (20% stocks, 30% cash)**
-            - Pre/post retirement (60+ years old)
-            - Cannot afford major losses
-            - But still exposed to inflation risk
-            
-            **💰 Cash Only (100% cash)**
-            - Zero market risk
-            - But purchasing power declines 2-3% annually
-            - Ironically the riskiest long-term strategy!
-            """)
-    
-    # Additional useful sections
-    if lang_code == "kr":
-        with st.expander("⚠️ 투자 시 주의사항 및 팁"):
-            st.markdown("""
-            ### 🎯 **성공적인 투자를 위한 원칙:**
-            
-            **1. 분산투자가 핵심**
-            - 한 바구니에 모든 달걀을 담지 마세요
-            - 여러 자산 클래스에 나누어 투자
-            - 지역적 분산 (한국 + 해외)
-            
-            **2. 시간이 가장 강력한 무기**
-            - 복리 효과: 돈이 돈을 벌어주는 효과
-            - 10년 vs 20년 투자 시 결과는 2배가 아닌 4배 차이
-            - 일찍 시작할수록 유리
-            
-            **3. 감정적 투자 금지**
-            - 주식이 오를 때 더 사고 싶고
-            - 떨어질 때 팔고 싶은 것이 인간 심리
-            - 하지만 이는 손실로 이어짐
-            
-            **4. 정기적 투자 (달러 비용 평균화)**
-            - 매월 일정 금액씩 투자
-            - 시장 타이밍을 예측할 필요 없음
-            - 장기적으로 평균 매입가 안정화
-            
-            ### ⚠️ **피해야 할 실수들:**
-            - 단기 수익률에 집착
-            - 남의 투자 성공담만 듣고 따라하기
-            - 투자 목적 없이 무작정 시작
-            - 비상자금 없이 전액 투자
-            - 이해하지 못하는 상품에 투자
-            """)
-    else:
-        with st.expander("⚠️ Investment Guidelines & Tips"):
-            st.markdown("""
-            ### 🎯 **Principles for Successful Investing:**
-            
-            **1. Diversification is Key**
-            - Don't put all eggs in one basket
-            - Spread across different asset classes
-            - Geographic diversification (domestic + international)
-            
-            **2. Time is Your Most Powerful Tool**
-            - Compound interest: money making money
-            - 10 years vs 20 years isn't 2x difference, it's 4x+
-            - Starting early gives massive advantages
-            
-            **3. Avoid Emotional Investing**
-            - Human nature: buy high (when excited), sell low (when scared)
-            - This leads to poor returns
-            - Stick to your strategy through ups and downs
-            
-            **4. Regular Investing (Dollar-Cost Averaging)**
-            - Invest fixed amounts regularly (monthly)
-            - No need to time the market
-            - Smooths out average purchase prices over time
-            
-            ### ⚠️ **Common Mistakes to Avoid:**
-            - Focusing on short-term performance
-            - Following others' success stories blindly
-            - Investing without clear goals
-            - Investing emergency funds
-            - Buying investments you don't understand
-            """)
+    # Educational sections (static text is only sent while an expander is open)
+    content = STATIC_CONTENT[lang_code]
+    render_static_expander(*content["asset_classes"], key="guide_asset_classes")
+    render_static_expander(*content["strategies"], key="guide_strategies")
+    render_static_expander(*content["tips"], key="guide_tips")
     
     # Key insights
     st.subheader(t["key_insights"])
     
     if len(results) >= 2:
         # Compare best vs worst performer
-        final_values = {k: v["portfolio_values"][-1] for k, v in results.items()}
+        final_values = {k: v.final_value for k, v in results.items()}
         best_strategy = max(final_values, key=final_values.get)
         worst_strategy = min(final_values, key=final_values.get)
         
@@ -818,41 +1723,7 @@ def main():
             st.success(f"💡 **{best_strategy}** {t['preserved_capital']} **{worst_strategy}** {t['depleted']}")
     
     # Educational content
-    with st.expander(t["understanding_results"]):
-        if lang_code == "kr":
-            st.markdown("""
-            **주요 지표 설명:**
-            - **최종 가치**: 기간 말 남은 자금
-            - **총 인출액**: 모든 연간 인출액의 합계 (인플레이션 조정 포함)
-            - **최대 낙폭**: 기간 중 최대 고점에서 저점까지의 하락폭
-            - **변동성**: 연간 수익률 변동 정도 (높을수록 변동성이 큼)
-            - **지속 기간**: 포트폴리오가 인출을 제공한 기간
-            - **성공률**: 전체 기간 동안 포트폴리오가 유지되었는지 여부
-            
-            **자산 클래스:**
-            - **주식**: 기업 주식 (높은 위험, 높은 잠재 수익)
-            - **채권**: 정부/기업 부채 (낮은 위험, 안정적 수입)
-            - **ETF**: 분산투자 펀드 (중간 위험)
-            - **부동산**: 부동산 투자 신탁 (부동산 노출)
-            - **현금**: 저축 계좌 (최저 위험, 최저 수익)
-            """)
-        else:
-            st.markdown("""
-            **Key Metrics Explained:**
-            - **Final Value**: How much money is left at the end of the period
-            - **Total Withdrawn**: Sum of all yearly withdrawals (adjusted for inflation if enabled)
-            - **Max Drawdown**: Largest peak-to-trough decline during the period
-            - **Volatility**: How much the returns varied year-to-year (higher = more volatile)
-            - **Years Lasted**: How long the portfolio provided withdrawals before depletion
-            - **Success Rate**: Whether the portfolio survived the entire period (simplified metric)
-            
-            **Asset Classes:**
-            - **Stocks**: Company shares (higher risk, higher potential returns)
-            - **Bonds**: Government/corporate debt (lower risk, steady income)
-            - **ETFs**: Diversified investment funds (moderate risk)
-            - **REITs**: Real estate investment trusts (property exposure)
-            - **Cash**: Savings accounts (lowest risk, lowest returns)
-            """)
+    render_static_expander(t["understanding_results"], content["results"], key="guide_results")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
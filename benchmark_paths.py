@@ -0,0 +1,58 @@
+"""Benchmark the path recursion backends on Monte Carlo scenarios.
+
+Usage: python benchmark_paths.py [--paths 20000] [--years 30] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import app
+
+
+def time_backend(backend, returns, capitals, withdrawal, repeat):
+    """Best-of-``repeat`` wall time for one backend, after a warm-up call"""
+    result = app.simulate_paths(returns, capitals, withdrawal, True, backend=backend)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        app.simulate_paths(returns, capitals, withdrawal, True, backend=backend)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=20000)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--withdrawal", type=float, default=12000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    asset_returns = app.generate_asset_returns(app.fit_return_model(), args.paths, args.years, "student_t", rng)
+    returns = app.apply_allocation(asset_returns, app.PRESET_STRATEGIES["🚀 Aggressive Growth"])
+    capitals = rng.uniform(50000, 300000, args.paths)
+
+    print(f"{args.paths:,} paths x {args.years} years (best of {args.repeat})")
+    timings = {}
+    reference = None
+    if app.njit is not None:
+        # Benchmark-only multithreaded variant; the app compiles the kernel serially
+        app.PATH_BACKENDS["numba_parallel"] = app.njit(parallel=True, cache=True)(app.python_path_kernel)
+    for backend in ["python", "numpy", "numba", "numba_parallel"]:
+        if backend not in app.PATH_BACKENDS:
+            print(f"{backend:>14}: unavailable")
+            continue
+        timings[backend], result = time_backend(backend, returns, capitals, args.withdrawal, args.repeat)
+        reference = reference or result
+        identical = all(np.array_equal(a, b) for a, b in zip(result, reference))
+        print(f"{backend:>14}: {timings[backend] * 1000:9.2f} ms  identical={identical}")
+
+    for backend, seconds in timings.items():
+        print(f"{backend:>14}: {timings['python'] / seconds:7.1f}x vs python, "
+              f"{timings['numpy'] / seconds:5.1f}x vs numpy")
+
+
+if __name__ == "__main__":
+    main()
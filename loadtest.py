@@ -0,0 +1,297 @@
+"""Load test the app with many concurrent simulated Streamlit sessions.
+
+Each session drives app.py through Streamlit's AppTest and replays an
+interaction trace (slider drags, strategy toggles, language switches, money
+edits, advanced options). Reports p50/p95/p99 rerun latency plus CPU time
+and peak RSS per session.
+
+Usage: python loadtest.py [--sessions 8] [--iterations 3] [--mode process|thread]
+                          [--trace mixed|<name>] [--think 0.0] [--json out.json]
+
+In ``process`` mode (default) every session runs in its own process, so CPU
+and RSS are measured per session. In ``thread`` mode all sessions share one
+process, like a single server instance; CPU and RSS are then whole-process
+figures divided across the sessions.
+
+Memory is reported as a baseline (interpreter plus app.py's imports, paid
+once per server process) and the growth over it for each session, which is
+what an extra concurrent user costs.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Widget positions in the sidebar: sliders 0/1 are start/end year, number
+# inputs 0/1 are capital/withdrawal, checkboxes 2/3/4 are the rolling cohort,
+# Monte Carlo and sensitivity analyses, select slider 0 is the Monte Carlo
+# path count. The background_jobs trace edits inputs while jobs are still
+# running, so job cancellation and resubmission on the shared worker pool
+# is part of the measured CPU and latency.
+TRACES = {
+    "slider_drag": [("slider", 0, year) for year in range(1995, 2011)],
+    "strategy_toggle": [
+        ("strategies", ["⚖️ Balanced Growth", "💰 Cash Only", "🚀 Aggressive Growth"]),
+        ("strategies", ["⚖️ Balanced Growth", "💰 Cash Only", "🚀 Aggressive Growth", "🏦 Income Focus"]),
+        ("strategies", ["⚖️ Balanced Growth", "🏦 Income Focus"]),
+        ("strategies", ["⚖️ Balanced Growth", "💰 Cash Only"]),
+    ],
+    "language_switch": [("language", "한국어"), ("language", "English")] * 2,
+    "money_edits": [("number_input", 0, 120000 + 10000 * i) for i in range(6)]
+                   + [("number_input", 1, 1500 + 1000 * i) for i in range(6)],
+    "advanced": [
+        ("checkbox", 4, True),
+        ("number_input", 1, 8000),
+        ("slider", 0, 2000),
+        ("checkbox", 4, False),
+    ],
+    "background_jobs": [
+        ("checkbox", 2, True),
+        ("checkbox", 3, True),
+        ("number_input", 1, 9000),
+        ("select_slider", 0, 20000),
+        ("slider", 0, 2000),
+        ("number_input", 0, 250000),
+        ("checkbox", 2, False),
+        ("checkbox", 3, False),
+    ],
+}
+
+
+def apply_action(at, action):
+    """Perform one widget interaction on an AppTest session"""
+    kind, *args = action
+    if kind == "language":
+        at.selectbox[0].set_value(args[0])
+    elif kind == "slider":
+        at.sidebar.slider[args[0]].set_value(args[1])
+    elif kind == "number_input":
+        at.sidebar.number_input[args[0]].set_value(args[1])
+    elif kind == "strategies":
+        at.sidebar.multiselect[0].set_value(args[0])
+    elif kind == "checkbox":
+        at.sidebar.checkbox[args[0]].set_value(args[1])
+    elif kind == "select_slider":
+        at.sidebar.select_slider[args[0]].set_value(args[1])
+    else:
+        raise ValueError(f"Unknown action: {kind!r}")
+
+
+def element_payload(node):
+    """Serialized size of every element proto in the rendered page, in bytes"""
+    proto = getattr(node, "proto", None)
+    total = proto.ByteSize() if proto is not None and hasattr(proto, "ByteSize") else 0
+    children = getattr(node, "children", None)
+    if isinstance(children, dict):
+        total += sum(element_payload(child) for child in children.values())
+    return total
+
+
+def current_rss_mb():
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def import_app_modules():
+    """Import app.py and its dependencies so they count towards the RSS baseline"""
+    sys.path.insert(0, os.path.dirname(APP_PATH))
+    import app  # noqa: F401
+    from streamlit.testing.v1 import AppTest  # noqa: F401
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is bytes on macOS, KiB elsewhere)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_session(session_id, trace_names, iterations, think, timeout):
+    """Replay traces in one AppTest session and return its measurements"""
+    from streamlit.testing.v1 import AppTest
+
+    import_app_modules()
+    baseline_rss_mb = current_rss_mb()
+    rng = random.Random(session_id)
+    cpu_start = cpu_seconds()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    latencies = []
+    payloads = []
+    errors = 0
+    failures = []
+
+    start = time.perf_counter()
+    try:
+        at.run()
+    except Exception as e:
+        # Timeouts and the like are counted, not fatal to the whole load test
+        errors += 1
+        failures.append(f"first run: {type(e).__name__}: {e}")
+    first_run_ms = (time.perf_counter() - start) * 1000
+
+    for _ in range(iterations):
+        for name in trace_names:
+            for action in TRACES[name]:
+                if think:
+                    time.sleep(rng.expovariate(1 / think))
+                try:
+                    # Widget lookups fail too when the previous run didn't render the page
+                    apply_action(at, action)
+                    start = time.perf_counter()
+                    at.run()
+                except Exception as e:
+                    errors += 1
+                    failures.append(f"{name} {action[0]}: {type(e).__name__}: {e}")
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                payloads.append(element_payload(at._tree))
+                errors += len(at.exception)
+
+    return {
+        "session": session_id,
+        "traces": trace_names,
+        "first_run_ms": first_run_ms,
+        "latencies_ms": latencies,
+        "payload_bytes": payloads,
+        "errors": errors,
+        "failures": failures,
+        "cpu_s": cpu_seconds() - cpu_start,
+        "baseline_rss_mb": baseline_rss_mb,
+        "rss_growth_mb": peak_rss_mb() - baseline_rss_mb,
+    }
+
+
+def serialize_script_parsing():
+    """Parse app.py under a lock when sessions share a process.
+
+    AppTest re-parses the script on every run (a real server caches the
+    bytecode once), and concurrent ast.parse calls can fail on CPython 3.11.
+    """
+    from streamlit.runtime.scriptrunner import magic
+
+    add_magic = magic.add_magic
+    lock = threading.Lock()
+
+    def locked_add_magic(code, script_path):
+        with lock:
+            return add_magic(code, script_path)
+
+    magic.add_magic = locked_add_magic
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(sessions, mode, wall_s, process_cpu_s=None, process_rss_mb=None, baseline_rss_mb=None):
+    """Aggregate latency, CPU and memory figures over all sessions"""
+    latencies = [ms for s in sessions for ms in s["latencies_ms"]]
+    payloads = [b for s in sessions for b in s["payload_bytes"]]
+    if mode == "thread":
+        # Sessions share one process, so resource figures are split evenly
+        cpu_per_session = [process_cpu_s / len(sessions)] * len(sessions)
+        rss_per_session = [(process_rss_mb - baseline_rss_mb) / len(sessions)] * len(sessions)
+    else:
+        cpu_per_session = [s["cpu_s"] for s in sessions]
+        rss_per_session = [s["rss_growth_mb"] for s in sessions]
+        baseline_rss_mb = statistics.median(s["baseline_rss_mb"] for s in sessions)
+
+    return {
+        "mode": mode,
+        "sessions": len(sessions),
+        "reruns": len(latencies),
+        "errors": sum(s["errors"] for s in sessions),
+        "wall_s": wall_s,
+        "reruns_per_s": len(latencies) / wall_s if wall_s else 0.0,
+        "first_run_ms_median": statistics.median(s["first_run_ms"] for s in sessions),
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies, default=0.0),
+        },
+        "payload_kb_median": statistics.median(payloads) / 1024 if payloads else 0.0,
+        "cpu_s_per_session": {"mean": statistics.mean(cpu_per_session), "max": max(cpu_per_session)},
+        "rss_baseline_mb": baseline_rss_mb,
+        "rss_mb_per_session": {"mean": statistics.mean(rss_per_session), "max": max(rss_per_session)},
+    }
+
+
+def print_report(report):
+    lat = report["latency_ms"]
+    print(f"{report['sessions']} sessions ({report['mode']} mode), {report['reruns']} reruns "
+          f"in {report['wall_s']:.1f}s ({report['reruns_per_s']:.1f} reruns/s), {report['errors']} errors")
+    print(f"  first run        median {report['first_run_ms_median']:8.1f} ms")
+    print(f"  rerun latency    p50 {lat['p50']:8.1f} ms   p95 {lat['p95']:8.1f} ms   "
+          f"p99 {lat['p99']:8.1f} ms   max {lat['max']:8.1f} ms")
+    print(f"  page payload     median {report['payload_kb_median']:8.1f} KB")
+    print(f"  CPU per session  mean {report['cpu_s_per_session']['mean']:8.2f} s    "
+          f"max {report['cpu_s_per_session']['max']:8.2f} s")
+    print(f"  RSS baseline          {report['rss_baseline_mb']:8.1f} MB   (interpreter and imports, once)")
+    print(f"  RSS per session  mean {report['rss_mb_per_session']['mean']:8.1f} MB   "
+          f"max {report['rss_mb_per_session']['max']:8.1f} MB   (growth over baseline)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=3, help="times each session replays its traces")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--trace", default="mixed", choices=["mixed", *TRACES],
+                        help="'mixed' gives each session a rotating mix of every trace")
+    parser.add_argument("--think", type=float, default=0.0, help="mean think time between interactions (s)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout (s)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    names = list(TRACES)
+    plans = [
+        names[i % len(names):] + names[:i % len(names)] if args.trace == "mixed" else [args.trace]
+        for i in range(args.sessions)
+    ]
+    jobs = [(i, plans[i], args.iterations, args.think, args.timeout) for i in range(args.sessions)]
+
+    start = time.perf_counter()
+    process_cpu_start = cpu_seconds()
+    if args.mode == "process":
+        # One fresh process per session, so each peak RSS belongs to a single session
+        with multiprocessing.get_context("spawn").Pool(args.sessions, maxtasksperchild=1) as pool:
+            sessions = pool.starmap(run_session, jobs, chunksize=1)
+        report = summarize(sessions, args.mode, time.perf_counter() - start)
+    else:
+        import_app_modules()
+        baseline_rss_mb = current_rss_mb()
+        process_cpu_start = cpu_seconds()
+        serialize_script_parsing()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            sessions = list(pool.map(lambda job: run_session(*job), jobs))
+        report = summarize(sessions, args.mode, time.perf_counter() - start,
+                           cpu_seconds() - process_cpu_start, peak_rss_mb(), baseline_rss_mb)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"report": report, "sessions": sessions}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()